@@ -4,14 +4,70 @@ GitHub Organization Repository Puller
 Fetches all repositories from a GitHub organization and clones them locally.
 """
 
+import json
+import logging
+import logging.handlers
 import os
+import queue
 import sys
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import subprocess
 import argparse
-from typing import List, Dict, Any
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional
 import time
 
+try:
+    import ijson  # Streaming JSON parser - optional but recommended for large orgs
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # C-accelerated JSON decoder - optional
+except ImportError:
+    orjson = None
+
+try:
+    from paramiko.agent import Agent as SSHAgent  # Direct agent-socket query - optional
+except ImportError:
+    SSHAgent = None
+
+# Fast-path extraction of the rel="next" URL from GitHub's Link header
+_NEXT_LINK_RE = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+# GitHub org logins: alphanumeric with inner hyphens, at most 39 chars
+_ORG_NAME_RE = re.compile(r'[A-Za-z0-9][A-Za-z0-9-]{0,38}')
+
+# Repository names as GitHub allows them; anything else (path separators,
+# empty strings, ...) must never reach a subprocess argv or a file path
+_REPO_NAME_RE = re.compile(r'[A-Za-z0-9._-]+')
+
+log = logging.getLogger('clone_all')
+
+# Conditional-request cache for org listings: {url: [etag, page_body, next_url]}
+_LISTING_CACHE_PATH = os.path.expanduser('~/.cache/github_org_puller/listing.json')
+
+# The only repository fields this tool ever reads; everything else the
+# API sends back is dropped as early as possible
+_REPO_FIELDS = ('name', 'clone_url', 'ssh_url', 'fork', 'archived')
+
+
+def _org_name(value: str) -> str:
+    """argparse type check: reject invalid org names before any API call."""
+    if not _ORG_NAME_RE.fullmatch(value):
+        raise argparse.ArgumentTypeError(f"invalid GitHub organization name: {value!r}")
+    return value
+
+
+def _decode_json(response) -> Any:
+    """Decode a JSON response body, preferring orjson when installed."""
+    if orjson is not None and getattr(response, 'content', None) is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 class GitHubOrgPuller:
     def __init__(self, token: str = None):
@@ -21,111 +77,356 @@ class GitHubOrgPuller:
             token: GitHub personal access token (optional but recommended)
         """
         self.session = requests.Session()
+        # Tune the connection pool for concurrent use and retry transient
+        # 5xx responses from api.github.com automatically
+        retry = Retry(total=5, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                      respect_retry_after_header=True,
+                      allowed_methods=frozenset(['GET', 'POST']))
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+        self.session.mount('https://', adapter)
+        # Repo listings compress ~10x; make the gzip negotiation explicit
+        # so a stray default can never turn it off
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+        self.token = token
         if token:
             self.session.headers.update({
                 'Authorization': f'token {token}',
                 'Accept': 'application/vnd.github.v3+json'
             })
         else:
-            print("Warning: No GitHub token provided. API rate limits will be lower.")
+            log.warning("Warning: No GitHub token provided. API rate limits will be lower.")
             self.session.headers.update({
                 'Accept': 'application/vnd.github.v3+json'
             })
     
     def check_ssh_agent(self) -> bool:
         """Check if SSH agent is running and has keys loaded."""
+        # Ask the agent directly over its Unix socket when we can; that
+        # saves forking a whole ssh-add process just to count keys
+        if SSHAgent is not None and os.environ.get('SSH_AUTH_SOCK'):
+            try:
+                if SSHAgent().get_keys():
+                    log.info("✅ SSH agent is running with loaded keys")
+                    return True
+                log.warning("⚠️  SSH agent is running but no keys are loaded")
+                log.warning("   Run: ssh-add ~/.ssh/id_ed25519")
+                return False
+            except Exception:
+                pass  # Fall back to the ssh-add probe below
         try:
             result = subprocess.run(['ssh-add', '-l'], capture_output=True, text=True)
             if result.returncode == 0:
-                print("✅ SSH agent is running with loaded keys")
+                log.info("✅ SSH agent is running with loaded keys")
                 return True
             else:
-                print("⚠️  SSH agent is running but no keys are loaded")
-                print("   Run: ssh-add ~/.ssh/id_ed25519")
+                log.warning("⚠️  SSH agent is running but no keys are loaded")
+                log.warning("   Run: ssh-add ~/.ssh/id_ed25519")
                 return False
         except FileNotFoundError:
-            print("⚠️  SSH agent not found")
+            log.warning("⚠️  SSH agent not found")
             return False
         except Exception:
-            print("⚠️  Could not check SSH agent status")
+            log.warning("⚠️  Could not check SSH agent status")
             return False
     
-    def get_all_repos(self, org_name: str) -> List[Dict[str, Any]]:
+    def get_all_repos(self, org_name: str, include_forks: bool = True,
+                      include_archived: bool = True) -> List[Dict[str, Any]]:
         """Fetch all repositories from a GitHub organization.
-        
+
+        Uses the GraphQL v4 API when a token is available (one lean query
+        per 100 repos instead of heavyweight REST pages), falling back to
+        REST when unauthenticated or when the token lacks GraphQL access.
+        Fork/archived exclusions are pushed into the query where the API
+        supports it, so filtered-out repos are never downloaded at all.
+
         Args:
             org_name: Name of the GitHub organization
-            
+            include_forks: Whether to include forked repositories
+            include_archived: Whether to include archived repositories
+
         Returns:
             List of repository dictionaries
         """
+        if self.token:
+            repos = self._get_all_repos_graphql(org_name, include_forks, include_archived)
+            if repos is not None:
+                return repos
+        return self._get_all_repos_rest(org_name, include_forks)
+
+    def _get_all_repos_graphql(self, org_name: str, include_forks: bool = True,
+                               include_archived: bool = True) -> Optional[List[Dict[str, Any]]]:
+        """Fetch the repo listing via GraphQL, selecting only the fields we use.
+
+        Returns None if GraphQL is not usable (e.g. classic token without
+        read:org scope) so the caller can fall back to REST.
+        """
+        repo_args = ['first: 100', 'after: $cursor']
+        if not include_forks:
+            repo_args.append('isFork: false')
+        if not include_archived:
+            repo_args.append('isArchived: false')
+        query = (
+            "query($org: String!, $cursor: String) {"
+            "  organization(login: $org) {"
+            f"    repositories({', '.join(repo_args)}) {{"
+            "      pageInfo { endCursor hasNextPage }"
+            "      nodes { name url sshUrl isFork isArchived }"
+            "    }"
+            "  }"
+            "}"
+        )
+
+        log.info(f"Fetching repositories for organization: {org_name} (GraphQL)")
+
         repos = []
-        page = 1
-        per_page = 100  # Maximum allowed by GitHub API
-        
-        print(f"Fetching repositories for organization: {org_name}")
-        
+        cursor = None
         while True:
-            url = f"https://api.github.com/orgs/{org_name}/repos"
-            params = {
-                'page': page,
-                'per_page': per_page,
-                'type': 'all',  # Include all repository types
-                'sort': 'updated',
-                'direction': 'desc'
-            }
-            
-            print(f"Fetching page {page}...")
-            response = self.session.get(url, params=params)
-            
-            if response.status_code == 404:
-                raise ValueError(f"Organization '{org_name}' not found or not accessible")
-            elif response.status_code == 403:
-                raise ValueError("API rate limit exceeded or insufficient permissions")
+            response = self.session.post(
+                'https://api.github.com/graphql',
+                json={'query': query, 'variables': {'org': org_name, 'cursor': cursor}}
+            )
+
+            if response.status_code == 401:
+                log.info("GraphQL not available with this token, falling back to REST")
+                return None
             elif response.status_code != 200:
                 raise ValueError(f"GitHub API error: {response.status_code} - {response.text}")
-            
-            page_repos = response.json()
-            
-            if not page_repos:  # No more repositories
-                break
-                
-            repos.extend(page_repos)
-            print(f"Found {len(page_repos)} repositories on page {page}")
-            
-            # Check if we've reached the last page
-            if len(page_repos) < per_page:
+
+            payload = _decode_json(response)
+            if payload.get('errors'):
+                raise ValueError(f"GitHub GraphQL error: {payload['errors']}")
+
+            org = payload['data']['organization']
+            if org is None:
+                raise ValueError(f"Organization '{org_name}' not found or not accessible")
+
+            connection = org['repositories']
+            for node in connection['nodes']:
+                # Map to the same shape the REST endpoint returns
+                repos.append({
+                    'name': node['name'],
+                    'clone_url': node['url'] + '.git',
+                    'ssh_url': node['sshUrl'],
+                    'fork': node['isFork'],
+                    'archived': node['isArchived'],
+                })
+
+            if not connection['pageInfo']['hasNextPage']:
                 break
-                
-            page += 1
-            
-            # Be nice to the API - add a small delay
-            time.sleep(0.1)
+            cursor = connection['pageInfo']['endCursor']
+
+        log.info(f"Total repositories found: {len(repos)}")
+        return repos
+
+    @staticmethod
+    def _parse_repo_page(response) -> List[Dict[str, Any]]:
+        """Decode one REST listing page, keeping only the fields we use.
+
+        When ijson is available the response body is parsed as a stream, so
+        the dozens of unused fields per repo never get allocated as Python
+        objects. Falls back to regular json() decoding otherwise.
+        """
+        if ijson is not None and getattr(response, 'raw', None) is not None:
+            # Have urllib3 gunzip transparently while we stream the body
+            response.raw.decode_content = True
+            return [
+                {field: item.get(field) for field in _REPO_FIELDS}
+                for item in ijson.items(response.raw, 'item')
+            ]
+        return [
+            {field: item.get(field) for field in _REPO_FIELDS}
+            for item in _decode_json(response)
+        ]
+
+    @staticmethod
+    def _load_listing_cache() -> Dict[str, Any]:
+        """Load the ETag cache of listing pages, or an empty one."""
+        try:
+            with open(_LISTING_CACHE_PATH) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_listing_cache(cache: Dict[str, Any]) -> None:
+        """Persist the ETag cache; best-effort, failures are ignored."""
+        try:
+            os.makedirs(os.path.dirname(_LISTING_CACHE_PATH), exist_ok=True)
+            with open(_LISTING_CACHE_PATH, 'w') as f:
+                json.dump(cache, f)
+        except OSError:
+            pass
+
+    def _get_all_repos_rest(self, org_name: str,
+                            include_forks: bool = True) -> List[Dict[str, Any]]:
+        """Fetch the repo listing via the paginated REST endpoint.
+
+        REST can exclude forks server-side (type=sources) but has no
+        archived filter; archived repos are dropped by the caller.
+        """
+        repos = []
+        page = 1
+        
+        log.info(f"Fetching repositories for organization: {org_name}")
+        
+        url = f"https://api.github.com/orgs/{org_name}/repos"
+        params = {
+            'per_page': 100,  # Maximum allowed by GitHub API
+            # type=sources excludes forks on the server side
+            'type': 'all' if include_forks else 'sources',
+            'sort': 'updated',
+            'direction': 'desc'
+        }
+        
+        # Conditional requests: a 304 for an unchanged page costs no rate
+        # limit and next to no bandwidth
+        cache = self._load_listing_cache()
+        cache_dirty = False
+
+        # Pipeline the pagination: the rel="next" URL is known from the
+        # headers before the body is parsed, so the next page can be in
+        # flight while this one is decoded
+        # Pre-bind the attributes touched on every iteration so the loop
+        # does a plain fast local lookup instead of the attribute dance
+        session_get = self.session.get
+        cache_get = cache.get
+        repos_extend = repos.extend
+
+        with ThreadPoolExecutor(max_workers=2) as prefetcher:
+            def fetch(fetch_url, fetch_params):
+                cached = cache_get(fetch_url)
+                headers = {'If-None-Match': cached[0]} if cached else None
+                future = prefetcher.submit(session_get, fetch_url,
+                                           params=fetch_params, stream=True, headers=headers)
+                return future, cached
+
+            rate_limit_retries = 0
+            future, cached = fetch(url, params)
+            while True:
+                log.info(f"Fetching page {page}...")
+                response = future.result()
+
+                if response.status_code == 404:
+                    raise ValueError(f"Organization '{org_name}' not found or not accessible")
+                elif response.status_code == 403:
+                    # Honor Retry-After (secondary rate limit) before giving
+                    # up, but only for a bounded number of attempts and only
+                    # for the delay-seconds form (the HTTP-date form is rare
+                    # and not worth parsing here)
+                    retry_after = response.headers.get('Retry-After', '')
+                    if retry_after.isdigit() and rate_limit_retries < 3:
+                        rate_limit_retries += 1
+                        log.info(f"Rate limited, retrying in {retry_after}s "
+                                 f"(attempt {rate_limit_retries}/3)...")
+                        time.sleep(int(retry_after))
+                        future, cached = fetch(url, params)
+                        continue
+                    raise ValueError("API rate limit exceeded or insufficient permissions")
+                elif response.status_code not in (200, 304):
+                    raise ValueError(f"GitHub API error: {response.status_code} - {response.text}")
+
+                # The Link header tells us when we're on the last page - no
+                # need for an extra round-trip to discover an empty page
+                next_match = _NEXT_LINK_RE.search(response.headers.get('Link', ''))
+                next_url = next_match.group(1) if next_match else None
+                if next_url is None and response.status_code == 304 and cached:
+                    # Link is optional on a 304, so fall back to the next-page
+                    # URL recorded when this page was last fetched in full -
+                    # otherwise a warm-cache run would truncate to one page
+                    next_url = cached[2] if len(cached) > 2 else None
+
+                # Only back off when the quota is nearly exhausted; GitHub
+                # tells us exactly how much is left in the rate-limit headers
+                remaining = response.headers.get('X-RateLimit-Remaining', '')
+                if remaining.isdigit() and int(remaining) < 10:
+                    reset = int(response.headers.get('X-RateLimit-Reset', '0')) - time.time()
+                    if reset > 0:
+                        log.info(f"Rate limit nearly exhausted, sleeping {reset:.0f}s until reset...")
+                        time.sleep(reset)
+
+                if next_url:
+                    # Start the next request before decoding this body
+                    next_future, next_cached = fetch(next_url, None)
+
+                if response.status_code == 304:
+                    page_repos = cached[1]
+                else:
+                    page_repos = self._parse_repo_page(response)
+                    etag = response.headers.get('ETag')
+                    if etag:
+                        cache[url] = [etag, page_repos, next_url]
+                        cache_dirty = True
+
+                if not page_repos:  # No more repositories
+                    break
+
+                repos_extend(page_repos)
+                log.info(f"Found {len(page_repos)} repositories on page {page}")
+
+                if not next_url:
+                    break
+
+                url, params = next_url, None
+                future, cached = next_future, next_cached
+                page += 1
+
+        if cache_dirty:
+            self._save_listing_cache(cache)
         
-        print(f"Total repositories found: {len(repos)}")
+        log.info(f"Total repositories found: {len(repos)}")
         return repos
     
-    def clone_repo(self, repo: Dict[str, Any], target_dir: str, use_ssh: bool = False) -> bool:
+    def clone_repo(self, repo: Dict[str, Any], target_dir: str, use_ssh: bool = False,
+                   shallow: bool = False, blobless: bool = False,
+                   recurse_submodules: bool = False,
+                   existing: frozenset = None, cache_dir: str = None) -> bool:
         """Clone a single repository.
-        
+
         Args:
             repo: Repository dictionary from GitHub API
             target_dir: Directory to clone into
             use_ssh: Whether to use SSH URLs instead of HTTPS
-            
+            shallow: Whether to make a depth-1 single-branch clone
+            blobless: Whether to make a partial clone that fetches blobs lazily
+            recurse_submodules: Whether to clone submodules too (fetched in parallel)
+            existing: Names already present in target_dir, from one scandir
+                pass; when given, absent repos skip the per-repo stat calls
+            cache_dir: Directory of shared bare repos; when given, objects
+                live there and the checkout is a worktree reusing them
+
         Returns:
             True if successful, False otherwise
         """
         repo_name = repo['name']
+        
+        # Defensive: a hostile listing must not be able to write outside
+        # target_dir or smuggle options into the git argv
+        if repo_name in ('.', '..') or not _REPO_NAME_RE.fullmatch(repo_name):
+            log.error(f"❌ Refusing to clone repo with invalid name: {repo_name!r}")
+            return False
+        
         clone_url = repo['ssh_url'] if use_ssh else repo['clone_url']
         repo_path = os.path.join(target_dir, repo_name)
         
-        # Skip if directory already exists
-        if os.path.exists(repo_path):
-            print(f"⚠️  {repo_name} already exists, skipping...")
+        if cache_dir:
+            # With a bare cache, "already have it" means the bare repo exists;
+            # the user-visible checkout is just a worktree over its objects
+            bare_path = os.path.join(cache_dir, repo_name + '.git')
+            updating = os.path.isdir(bare_path)
+        # Refresh repos we already have instead of skipping them, so repeat
+        # runs pick up new commits at fetch cost rather than clone cost
+        elif existing is not None and repo_name not in existing:
+            updating = False
+        elif os.path.isdir(os.path.join(repo_path, '.git')):
+            updating = True
+        elif existing is not None or os.path.exists(repo_path):
+            # A leftover directory that isn't a git repo can't be cloned into
+            log.warning(f"⚠️  {repo_name} already exists, skipping...")
             return True
+        else:
+            updating = False
         
-        print(f"📦 Cloning {repo_name}...")
+        log.info(f"🔄 Updating {repo_name}..." if updating else f"📦 Cloning {repo_name}...")
         
         try:
             # Set up environment for SSH agent
@@ -136,103 +437,178 @@ class GitHubOrgPuller:
                 # Disable SSH host key checking for automated cloning
                 env['GIT_SSH_COMMAND'] = 'ssh -o StrictHostKeyChecking=no -o BatchMode=yes'
             
-            # Clone the repository
-            result = subprocess.run([
-                'git', 'clone', clone_url, repo_path
-            ], capture_output=True, text=True, timeout=300, env=env)  # 5 minute timeout
-            
-            if result.returncode == 0:
-                print(f"✅ Successfully cloned {repo_name}")
-                return True
-            else:
-                error_msg = result.stderr.strip()
-                if "Permission denied" in error_msg and use_ssh:
-                    print(f"❌ SSH authentication failed for {repo_name}. Make sure ssh-agent is running and key is added.")
-                    print("   Try: ssh-add ~/.ssh/id_ed25519")
+            # Clone the repository, or fetch if we already have it
+            if cache_dir:
+                # Keep the objects in a shared bare repo (clone once, then
+                # cheap fetches) and materialize the checkout as a worktree
+                if updating:
+                    # A bare clone has no remote.origin.fetch refspec, so a
+                    # plain fetch would only write FETCH_HEAD and leave the
+                    # cached branch refs frozen; spell the refspec out so
+                    # refs/heads/* actually advance for the worktrees
+                    cmds = [['git', '-C', bare_path, 'fetch', 'origin',
+                             '+refs/heads/*:refs/heads/*', '--prune', '--quiet']]
                 else:
-                    print(f"❌ Failed to clone {repo_name}: {error_msg}")
-                return False
+                    os.makedirs(cache_dir, exist_ok=True)
+                    bare_cmd = ['git', 'clone', '--bare', '--quiet']
+                    if blobless:
+                        bare_cmd += ['--filter=blob:none']
+                    cmds = [bare_cmd + [clone_url, bare_path]]
+                has_checkout = (repo_name in existing if existing is not None
+                                else os.path.exists(repo_path))
+                if not has_checkout:
+                    cmds.append(['git', '-C', bare_path, 'worktree', 'add',
+                                 os.path.abspath(repo_path)])
+            elif updating:
+                cmds = [['git', '-C', repo_path, 'fetch', '--all', '--prune', '--tags', '--quiet']]
+            else:
+                cmd = ['git', 'clone', '--quiet']
+                if shallow:
+                    # History-free snapshot: orders of magnitude less network/disk
+                    cmd += ['--depth=1', '--single-branch', '--no-tags']
+                elif blobless:
+                    # Partial clone: commits and trees now, blobs hydrated on
+                    # demand - full history semantics at a fraction of the bytes
+                    cmd += ['--filter=blob:none']
+                if recurse_submodules:
+                    # --jobs parallelizes the submodule fetches, which git
+                    # otherwise runs serially one after another
+                    cmd += ['--recurse-submodules', '--jobs=8', '--shallow-submodules']
+                cmd += [clone_url, repo_path]
+                cmds = [cmd]
+            
+            action = "updated" if updating else "cloned"
+            for cmd in cmds:
+                # Drive git via a Popen handle rather than subprocess.run so
+                # stdout goes straight to /dev/null instead of being buffered
+                # into a Python bytes object per child; stderr is kept for
+                # error classification below
+                proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.PIPE, text=True, env=env)
+                try:
+                    _, stderr = proc.communicate(timeout=300)  # 5 minute timeout
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.communicate()
+                    raise
+                
+                if proc.returncode != 0:
+                    error_msg = stderr.strip()
+                    if "Permission denied" in error_msg and use_ssh:
+                        log.error(f"❌ SSH authentication failed for {repo_name}. Make sure ssh-agent is running and key is added.")
+                        log.error("   Try: ssh-add ~/.ssh/id_ed25519")
+                    else:
+                        log.error(f"❌ Failed to {action.rstrip('d')} {repo_name}: {error_msg}")
+                    return False
+            
+            log.info(f"✅ Successfully {action} {repo_name}")
+            return True
                 
         except subprocess.TimeoutExpired:
-            print(f"❌ Timeout while cloning {repo_name}")
+            log.error(f"❌ Timeout while {'updating' if updating else 'cloning'} {repo_name}")
             return False
         except FileNotFoundError:
-            print("❌ Git is not installed or not in PATH")
+            log.error("❌ Git is not installed or not in PATH")
             return False
         except Exception as e:
-            print(f"❌ Error cloning {repo_name}: {str(e)}")
+            log.error(f"❌ Error cloning {repo_name}: {str(e)}")
             return False
     
-    def pull_all_repos(self, org_name: str, target_dir: str = None, use_ssh: bool = False, 
-                      include_forks: bool = True, include_archived: bool = True) -> None:
+    def pull_all_repos(self, org_name: str, target_dir: str = None, use_ssh: bool = False,
+                      include_forks: bool = True, include_archived: bool = True,
+                      jobs: int = 10, shallow: bool = False, blobless: bool = False,
+                      recurse_submodules: bool = False, cache_dir: str = None) -> None:
         """Pull all repositories from an organization.
-        
+
         Args:
             org_name: Name of the GitHub organization
             target_dir: Directory to clone repositories into (default: org_name)
             use_ssh: Whether to use SSH URLs instead of HTTPS
             include_forks: Whether to include forked repositories
             include_archived: Whether to include archived repositories
+            jobs: Number of repositories to clone concurrently
+            shallow: Whether to make depth-1 single-branch clones
+            blobless: Whether to make blobless partial clones
+            recurse_submodules: Whether to clone submodules too
+            cache_dir: Directory for shared bare repos reused across runs
         """
         if target_dir is None:
             target_dir = org_name
         
+        # Keep each org's bare repos in their own cache subdirectory
+        if cache_dir is not None:
+            cache_dir = os.path.join(os.path.expanduser(cache_dir), org_name)
+        
         # Create target directory if it doesn't exist
         os.makedirs(target_dir, exist_ok=True)
-        print(f"Cloning repositories to: {os.path.abspath(target_dir)}")
+        log.info(f"Cloning repositories to: {os.path.abspath(target_dir)}")
         
         # Check SSH agent if using SSH
         if use_ssh:
-            print("\nChecking SSH configuration...")
+            log.info("\nChecking SSH configuration...")
             if not self.check_ssh_agent():
-                print("Warning: SSH issues detected. Consider using HTTPS instead or fix SSH setup.")
+                log.warning("Warning: SSH issues detected. Consider using HTTPS instead or fix SSH setup.")
                 response = input("Continue anyway? (y/n): ").strip().lower()
                 if response != 'y':
                     return
         
         try:
-            # Get all repositories
-            repos = self.get_all_repos(org_name)
+            # Get all repositories; fork/archived exclusions are applied
+            # in the API query where possible
+            repos = self.get_all_repos(org_name, include_forks, include_archived)
             
-            # Filter repositories based on options
+            # Filter out whatever the server-side query couldn't exclude
             filtered_repos = []
             for repo in repos:
                 if not include_forks and repo['fork']:
-                    print(f"Skipping fork: {repo['name']}")
+                    log.info(f"Skipping fork: {repo['name']}")
                     continue
                 if not include_archived and repo['archived']:
-                    print(f"Skipping archived repo: {repo['name']}")
+                    log.info(f"Skipping archived repo: {repo['name']}")
                     continue
                 filtered_repos.append(repo)
             
-            print(f"\nWill clone {len(filtered_repos)} repositories")
+            log.info(f"\nWill clone {len(filtered_repos)} repositories")
             
-            # Clone each repository
+            # Clone repositories concurrently - cloning is network/IO-bound,
+            # so threads work well here (subprocess.run releases the GIL)
             successful = 0
             failed = 0
+
+            # One directory read up front instead of a stat syscall per repo
+            existing = frozenset(
+                entry.name for entry in os.scandir(target_dir) if entry.is_dir()
+            )
             
-            for i, repo in enumerate(filtered_repos, 1):
-                print(f"\n[{i}/{len(filtered_repos)}] ", end="")
-                if self.clone_repo(repo, target_dir, use_ssh):
-                    successful += 1
-                else:
-                    failed += 1
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = {
+                    executor.submit(self.clone_repo, repo, target_dir, use_ssh,
+                                    shallow, blobless, recurse_submodules, existing,
+                                    cache_dir): repo
+                    for repo in filtered_repos
+                }
+                for i, future in enumerate(as_completed(futures), 1):
+                    log.info(f"[{i}/{len(filtered_repos)}] done: {futures[future]['name']}")
+                    if future.result():
+                        successful += 1
+                    else:
+                        failed += 1
             
             # Summary
-            print(f"\n{'='*50}")
-            print(f"SUMMARY")
-            print(f"{'='*50}")
-            print(f"Total repositories: {len(filtered_repos)}")
-            print(f"Successfully cloned: {successful}")
-            print(f"Failed: {failed}")
+            log.info(f"\n{'='*50}")
+            log.info(f"SUMMARY")
+            log.info(f"{'='*50}")
+            log.info(f"Total repositories: {len(filtered_repos)}")
+            log.info(f"Successfully cloned: {successful}")
+            log.info(f"Failed: {failed}")
             
             if failed > 0:
-                print(f"\n⚠️  {failed} repositories failed to clone. Check the output above for details.")
+                log.warning(f"\n⚠️  {failed} repositories failed to clone. Check the output above for details.")
             else:
-                print(f"\n🎉 All repositories cloned successfully!")
+                log.info(f"\n🎉 All repositories cloned successfully!")
                 
         except Exception as e:
-            print(f"❌ Error: {str(e)}")
+            log.error(f"❌ Error: {str(e)}")
             sys.exit(1)
 
 
@@ -249,29 +625,51 @@ Examples:
         """
     )
     
-    parser.add_argument('organization', help='GitHub organization name')
+    parser.add_argument('organization', type=_org_name, help='GitHub organization name')
     parser.add_argument('--token', help='GitHub personal access token (recommended)')
     parser.add_argument('--target-dir', help='Directory to clone repositories into (default: organization name)')
     parser.add_argument('--ssh', action='store_true', help='Use SSH URLs instead of HTTPS')
     parser.add_argument('--no-forks', action='store_true', help='Exclude forked repositories')
     parser.add_argument('--no-archived', action='store_true', help='Exclude archived repositories')
+    parser.add_argument('--jobs', type=int, default=10, help='Number of concurrent clone jobs (default: 10)')
+    clone_mode = parser.add_mutually_exclusive_group()
+    clone_mode.add_argument('--shallow', action='store_true', help='Make depth-1 single-branch clones (much faster, no history)')
+    clone_mode.add_argument('--blobless', action='store_true', help='Make blobless partial clones (full history, blobs fetched on demand)')
+    parser.add_argument('--recurse-submodules', action='store_true', help='Also clone submodules (fetched in parallel)')
+    parser.add_argument('--cache-dir', help='Keep shared bare repos here (e.g. ~/.cache/clone-all) and check out via git worktree')
     
     args = parser.parse_args()
     
+    # Route log records through a queue so clone threads never block on
+    # stdout; a single listener thread does the actual writes
+    log_queue = queue.SimpleQueue()
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    log.setLevel(logging.INFO)
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    listener.start()
+    
     # Get token from environment variable if not provided
     token = args.token or os.getenv('GITHUB_TOKEN')
     
-    # Initialize the puller
-    puller = GitHubOrgPuller(token)
-    
-    # Pull all repositories
-    puller.pull_all_repos(
-        org_name=args.organization,
-        target_dir=args.target_dir,
-        use_ssh=args.ssh,
-        include_forks=not args.no_forks,
-        include_archived=not args.no_archived
-    )
+    try:
+        # Initialize the puller
+        puller = GitHubOrgPuller(token)
+        
+        # Pull all repositories
+        puller.pull_all_repos(
+            org_name=args.organization,
+            target_dir=args.target_dir,
+            use_ssh=args.ssh,
+            include_forks=not args.no_forks,
+            include_archived=not args.no_archived,
+            jobs=args.jobs,
+            shallow=args.shallow,
+            blobless=args.blobless,
+            recurse_submodules=args.recurse_submodules,
+            cache_dir=args.cache_dir
+        )
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
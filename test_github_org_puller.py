@@ -1,3 +1,5 @@
+import io
+import json
 import os
 import sys
 import types
@@ -5,13 +7,39 @@ import pytest
 import tempfile
 import shutil
 from unittest import mock
-from github_org_puller import GitHubOrgPuller
+import argparse
+from github_org_puller import GitHubOrgPuller, _org_name
+
+class FakeProc:
+    """Stands in for the subprocess.Popen handle clone_repo creates."""
+    last_cmd = None
+    cmds = []
+    returncode = 0
+    stderr = ''
+    def __init__(self, cmd, *args, **kwargs):
+        type(self).last_cmd = cmd
+        type(self).cmds.append(cmd)
+    def communicate(self, timeout=None):
+        self.returncode = type(self).returncode
+        return ('', type(self).stderr)
+    def kill(self):
+        pass
+
+@pytest.fixture
+def fake_popen(monkeypatch):
+    FakeProc.last_cmd = None
+    FakeProc.cmds = []
+    FakeProc.returncode = 0
+    FakeProc.stderr = ''
+    monkeypatch.setattr('subprocess.Popen', FakeProc)
+    return FakeProc
 
 class DummyResponse:
-    def __init__(self, status_code, json_data=None, text=""):
+    def __init__(self, status_code, json_data=None, text="", headers=None):
         self.status_code = status_code
         self._json = json_data or []
         self.text = text
+        self.headers = headers or {}
     def json(self):
         return self._json
 
@@ -32,7 +60,7 @@ def test_get_all_repos_success(monkeypatch):
         DummyResponse(200, [{"name": "repo1", "fork": False, "archived": False}, {"name": "repo2", "fork": False, "archived": False}]),
         DummyResponse(200, [])
     ]
-    def fake_get(url, params=None):
+    def fake_get(url, params=None, **kwargs):
         return responses.pop(0)
     puller.session.get = fake_get
     repos = puller.get_all_repos("dummyorg")
@@ -41,16 +69,15 @@ def test_get_all_repos_success(monkeypatch):
 
 def test_get_all_repos_404(monkeypatch):
     puller = GitHubOrgPuller()
-    puller.session.get = lambda url, params=None: DummyResponse(404)
+    puller.session.get = lambda url, params=None, **kwargs: DummyResponse(404)
     with pytest.raises(ValueError):
         puller.get_all_repos("notfound")
 
-def test_clone_repo_success(monkeypatch):
+def test_clone_repo_success(monkeypatch, fake_popen):
     puller = GitHubOrgPuller()
     repo = {"name": "repo1", "clone_url": "https://github.com/org/repo1.git", "ssh_url": "git@github.com:org/repo1.git"}
     with tempfile.TemporaryDirectory() as tmpdir:
         monkeypatch.setattr('os.path.exists', lambda path: False)
-        monkeypatch.setattr('subprocess.run', lambda *a, **k: types.SimpleNamespace(returncode=0, stdout='', stderr=''))
         assert puller.clone_repo(repo, tmpdir, use_ssh=False) is True
 
 def test_clone_repo_already_exists(monkeypatch):
@@ -59,21 +86,297 @@ def test_clone_repo_already_exists(monkeypatch):
     monkeypatch.setattr('os.path.exists', lambda path: True)
     assert puller.clone_repo(repo, "/tmp", use_ssh=False) is True
 
-def test_clone_repo_fail(monkeypatch):
+def test_clone_repo_fail(monkeypatch, fake_popen):
     puller = GitHubOrgPuller()
     repo = {"name": "repo1", "clone_url": "https://github.com/org/repo1.git", "ssh_url": "git@github.com:org/repo1.git"}
     monkeypatch.setattr('os.path.exists', lambda path: False)
-    monkeypatch.setattr('subprocess.run', lambda *a, **k: types.SimpleNamespace(returncode=1, stdout='', stderr='Permission denied'))
+    fake_popen.returncode = 1
+    fake_popen.stderr = 'Permission denied'
     assert puller.clone_repo(repo, "/tmp", use_ssh=True) is False
 
 def test_pull_all_repos_filters(monkeypatch):
     puller = GitHubOrgPuller()
     # Simulate get_all_repos returns 3 repos
-    monkeypatch.setattr(puller, 'get_all_repos', lambda org: [
+    monkeypatch.setattr(puller, 'get_all_repos', lambda org, *f: [
         {"name": "repo1", "fork": False, "archived": False, "clone_url": "", "ssh_url": ""},
         {"name": "repo2", "fork": True, "archived": False, "clone_url": "", "ssh_url": ""},
         {"name": "repo3", "fork": False, "archived": True, "clone_url": "", "ssh_url": ""},
     ])
-    monkeypatch.setattr(puller, 'clone_repo', lambda repo, target_dir, use_ssh: True)
+    monkeypatch.setattr(puller, 'clone_repo', lambda repo, target_dir, use_ssh, *opts: True)
     # Should only clone repo1 if both filters are off
     puller.pull_all_repos("dummyorg", target_dir=None, use_ssh=False, include_forks=False, include_archived=False)
+
+def test_pull_all_repos_clones_concurrently(monkeypatch):
+    puller = GitHubOrgPuller()
+    repos = [
+        {"name": f"repo{i}", "fork": False, "archived": False, "clone_url": "", "ssh_url": ""}
+        for i in range(5)
+    ]
+    monkeypatch.setattr(puller, 'get_all_repos', lambda org, *f: repos)
+    cloned = []
+    monkeypatch.setattr(puller, 'clone_repo', lambda repo, target_dir, use_ssh, *opts: cloned.append(repo["name"]) or True)
+    puller.pull_all_repos("dummyorg", jobs=3)
+    assert sorted(cloned) == [f"repo{i}" for i in range(5)]
+
+def test_clone_repo_shallow_args(monkeypatch, fake_popen):
+    puller = GitHubOrgPuller()
+    repo = {"name": "repo1", "clone_url": "https://github.com/org/repo1.git", "ssh_url": "git@github.com:org/repo1.git"}
+    monkeypatch.setattr('os.path.exists', lambda path: False)
+    assert puller.clone_repo(repo, "/tmp", use_ssh=False, shallow=True) is True
+    assert "--depth=1" in fake_popen.last_cmd
+    assert "--single-branch" in fake_popen.last_cmd
+
+def test_clone_repo_recurse_submodules_args(monkeypatch, fake_popen):
+    puller = GitHubOrgPuller()
+    repo = {"name": "repo1", "clone_url": "https://github.com/org/repo1.git", "ssh_url": "git@github.com:org/repo1.git"}
+    monkeypatch.setattr('os.path.exists', lambda path: False)
+    assert puller.clone_repo(repo, "/tmp", recurse_submodules=True) is True
+    assert "--recurse-submodules" in fake_popen.last_cmd
+    assert "--jobs=8" in fake_popen.last_cmd
+
+def test_get_all_repos_graphql(monkeypatch):
+    puller = GitHubOrgPuller(token="t0ken")
+    pages = [
+        DummyResponse(200, {"data": {"organization": {"repositories": {
+            "pageInfo": {"endCursor": "c1", "hasNextPage": True},
+            "nodes": [{"name": "repo1", "url": "https://github.com/org/repo1", "sshUrl": "git@github.com:org/repo1.git", "isFork": False, "isArchived": False}],
+        }}}}),
+        DummyResponse(200, {"data": {"organization": {"repositories": {
+            "pageInfo": {"endCursor": None, "hasNextPage": False},
+            "nodes": [{"name": "repo2", "url": "https://github.com/org/repo2", "sshUrl": "git@github.com:org/repo2.git", "isFork": True, "isArchived": False}],
+        }}}}),
+    ]
+    puller.session.post = lambda url, json=None: pages.pop(0)
+    repos = puller.get_all_repos("dummyorg")
+    assert [r["name"] for r in repos] == ["repo1", "repo2"]
+    assert repos[0]["clone_url"] == "https://github.com/org/repo1.git"
+    assert repos[1]["fork"] is True
+
+def test_get_all_repos_graphql_falls_back_to_rest(monkeypatch):
+    puller = GitHubOrgPuller(token="t0ken")
+    puller.session.post = lambda url, json=None: DummyResponse(401)
+    responses = [
+        DummyResponse(200, [{"name": "repo1", "fork": False, "archived": False}]),
+        DummyResponse(200, [])
+    ]
+    puller.session.get = lambda url, params=None, **kwargs: responses.pop(0)
+    repos = puller.get_all_repos("dummyorg")
+    assert [r["name"] for r in repos] == ["repo1"]
+
+def test_get_all_repos_retries_on_403_with_retry_after(monkeypatch):
+    puller = GitHubOrgPuller()
+    responses = [
+        DummyResponse(403, headers={"Retry-After": "7"}),
+        DummyResponse(200, [{"name": "repo1", "fork": False, "archived": False}]),
+        DummyResponse(200, [])
+    ]
+    puller.session.get = lambda url, params=None, **kwargs: responses.pop(0)
+    slept = []
+    monkeypatch.setattr('time.sleep', lambda s: slept.append(s))
+    repos = puller.get_all_repos("dummyorg")
+    assert [r["name"] for r in repos] == ["repo1"]
+    assert slept == [7]
+
+def test_get_all_repos_follows_link_header(monkeypatch):
+    puller = GitHubOrgPuller()
+    responses = [
+        DummyResponse(200, [{"name": "repo1", "fork": False, "archived": False}],
+                      headers={"Link": '<https://api.github.com/orgs/dummyorg/repos?page=2>; rel="next"'}),
+        DummyResponse(200, [{"name": "repo2", "fork": False, "archived": False}]),
+    ]
+    urls = []
+    def fake_get(url, params=None, **kwargs):
+        urls.append(url)
+        return responses.pop(0)
+    puller.session.get = fake_get
+    repos = puller.get_all_repos("dummyorg")
+    assert [r["name"] for r in repos] == ["repo1", "repo2"]
+    assert urls[1] == "https://api.github.com/orgs/dummyorg/repos?page=2"
+
+def test_session_mounts_pooled_retry_adapter():
+    puller = GitHubOrgPuller()
+    adapter = puller.session.get_adapter("https://api.github.com")
+    assert adapter.max_retries.total == 5
+    assert 502 in adapter.max_retries.status_forcelist
+
+def test_parse_repo_page_projects_fields():
+    resp = DummyResponse(200, [{"name": "repo1", "fork": False, "archived": False,
+                                "clone_url": "u", "ssh_url": "s", "owner": {"login": "x"},
+                                "permissions": {"admin": True}}])
+    page = GitHubOrgPuller._parse_repo_page(resp)
+    assert page == [{"name": "repo1", "clone_url": "u", "ssh_url": "s", "fork": False, "archived": False}]
+
+def test_clone_repo_updates_existing_checkout(monkeypatch, fake_popen):
+    puller = GitHubOrgPuller()
+    repo = {"name": "repo1", "clone_url": "https://github.com/org/repo1.git", "ssh_url": "git@github.com:org/repo1.git"}
+    monkeypatch.setattr('os.path.isdir', lambda path: path.endswith('.git'))
+    assert puller.clone_repo(repo, "/tmp") is True
+    assert fake_popen.last_cmd[:4] == ["git", "-C", os.path.join("/tmp", "repo1"), "fetch"]
+
+def test_get_all_repos_etag_cache_roundtrip(monkeypatch, tmp_path):
+    monkeypatch.setattr('github_org_puller._LISTING_CACHE_PATH', str(tmp_path / "listing.json"))
+    puller = GitHubOrgPuller()
+    # First run: 200 with an ETag populates the cache
+    puller.session.get = lambda url, params=None, **kwargs: DummyResponse(
+        200, [{"name": "repo1", "fork": False, "archived": False}], headers={"ETag": 'W/"abc"'})
+    assert [r["name"] for r in puller.get_all_repos("dummyorg")] == ["repo1"]
+    # Second run: the conditional request gets a 304 and the cached page is used
+    seen = {}
+    def fake_get(url, params=None, headers=None, **kwargs):
+        seen["headers"] = headers
+        return DummyResponse(304)
+    puller.session.get = fake_get
+    assert [r["name"] for r in puller.get_all_repos("dummyorg")] == ["repo1"]
+    assert seen["headers"] == {"If-None-Match": 'W/"abc"'}
+
+def test_clone_repo_skips_stat_for_absent_repos(monkeypatch, fake_popen):
+    puller = GitHubOrgPuller()
+    repo = {"name": "repo1", "clone_url": "https://github.com/org/repo1.git", "ssh_url": "git@github.com:org/repo1.git"}
+    def boom(path):
+        raise AssertionError("should not stat when existing set is provided")
+    monkeypatch.setattr('os.path.exists', boom)
+    monkeypatch.setattr('os.path.isdir', boom)
+    assert puller.clone_repo(repo, "/tmp", existing=frozenset({"other"})) is True
+    assert fake_popen.last_cmd[:3] == ["git", "clone", "--quiet"]
+
+def test_clone_repo_blobless_args(monkeypatch, fake_popen):
+    puller = GitHubOrgPuller()
+    repo = {"name": "repo1", "clone_url": "https://github.com/org/repo1.git", "ssh_url": "git@github.com:org/repo1.git"}
+    monkeypatch.setattr('os.path.exists', lambda path: False)
+    assert puller.clone_repo(repo, "/tmp", blobless=True) is True
+    assert "--filter=blob:none" in fake_popen.last_cmd
+
+def test_get_all_repos_rest_excludes_forks_server_side():
+    puller = GitHubOrgPuller()
+    seen = {}
+    def fake_get(url, params=None, **kwargs):
+        seen["params"] = params
+        return DummyResponse(200, [])
+    puller.session.get = fake_get
+    puller.get_all_repos("dummyorg", include_forks=False)
+    assert seen["params"]["type"] == "sources"
+
+def test_get_all_repos_graphql_filters_in_query():
+    puller = GitHubOrgPuller(token="t0ken")
+    seen = {}
+    def fake_post(url, json=None):
+        seen["query"] = json["query"]
+        return DummyResponse(200, {"data": {"organization": {"repositories": {
+            "pageInfo": {"endCursor": None, "hasNextPage": False}, "nodes": []}}}})
+    puller.session.post = fake_post
+    puller.get_all_repos("dummyorg", include_forks=False, include_archived=False)
+    assert "isFork: false" in seen["query"]
+    assert "isArchived: false" in seen["query"]
+
+def test_org_name_validation():
+    assert _org_name("microsoft") == "microsoft"
+    assert _org_name("my-org-1") == "my-org-1"
+    for bad in ("", "-leading", "a" * 40, "evil;rm -rf /", "../etc"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            _org_name(bad)
+
+def test_clone_repo_rejects_traversal_names(fake_popen):
+    puller = GitHubOrgPuller()
+    repo = {"name": "../escape", "clone_url": "x", "ssh_url": "y"}
+    assert puller.clone_repo(repo, "/tmp") is False
+    assert fake_popen.last_cmd is None
+
+def test_check_ssh_agent_prefers_agent_socket(monkeypatch):
+    puller = GitHubOrgPuller()
+    monkeypatch.setenv('SSH_AUTH_SOCK', '/tmp/agent.sock')
+    class FakeAgent:
+        def get_keys(self):
+            return ("key",)
+    monkeypatch.setattr('github_org_puller.SSHAgent', FakeAgent)
+    def boom(*a, **k):
+        raise AssertionError("should not spawn ssh-add when the agent socket answers")
+    monkeypatch.setattr('subprocess.run', boom)
+    assert puller.check_ssh_agent() is True
+
+def test_session_requests_gzip():
+    puller = GitHubOrgPuller()
+    assert puller.session.headers['Accept-Encoding'] == 'gzip, deflate'
+
+def test_clone_repo_with_cache_dir_uses_bare_plus_worktree(monkeypatch, fake_popen, tmp_path):
+    puller = GitHubOrgPuller()
+    repo = {"name": "repo1", "clone_url": "https://github.com/org/repo1.git", "ssh_url": "git@github.com:org/repo1.git"}
+    monkeypatch.setattr('os.path.exists', lambda path: False)
+    monkeypatch.setattr('os.path.isdir', lambda path: False)
+    cache = str(tmp_path / "cache")
+    assert puller.clone_repo(repo, "/tmp", cache_dir=cache) is True
+    bare = os.path.join(cache, "repo1.git")
+    assert fake_popen.cmds[0][:4] == ["git", "clone", "--bare", "--quiet"]
+    assert fake_popen.cmds[0][-1] == bare
+    assert fake_popen.cmds[1][:5] == ["git", "-C", bare, "worktree", "add"]
+
+def test_clone_repo_with_cache_dir_fetches_existing_bare(monkeypatch, fake_popen, tmp_path):
+    puller = GitHubOrgPuller()
+    repo = {"name": "repo1", "clone_url": "https://github.com/org/repo1.git", "ssh_url": "git@github.com:org/repo1.git"}
+    monkeypatch.setattr('os.path.isdir', lambda path: path.endswith('repo1.git'))
+    cache = str(tmp_path / "cache")
+    assert puller.clone_repo(repo, "/tmp", existing=frozenset({"repo1"}), cache_dir=cache) is True
+    # The explicit refspec is load-bearing: a bare clone has no configured
+    # remote.origin.fetch, so without it the cached branch refs never move
+    assert fake_popen.cmds == [["git", "-C", os.path.join(cache, "repo1.git"), "fetch", "origin",
+                                "+refs/heads/*:refs/heads/*", "--prune", "--quiet"]]
+
+def test_get_all_repos_etag_cache_resumes_pagination_without_link(monkeypatch, tmp_path):
+    monkeypatch.setattr('github_org_puller._LISTING_CACHE_PATH', str(tmp_path / "listing.json"))
+    puller = GitHubOrgPuller()
+    page2_url = "https://api.github.com/orgs/dummyorg/repos?page=2"
+    # First run: two full pages populate the cache, including the next link
+    responses = [
+        DummyResponse(200, [{"name": "repo1", "fork": False, "archived": False}],
+                      headers={"ETag": 'W/"p1"', "Link": f'<{page2_url}>; rel="next"'}),
+        DummyResponse(200, [{"name": "repo2", "fork": False, "archived": False}],
+                      headers={"ETag": 'W/"p2"'}),
+    ]
+    puller.session.get = lambda url, params=None, **kwargs: responses.pop(0)
+    assert [r["name"] for r in puller.get_all_repos("dummyorg")] == ["repo1", "repo2"]
+    # Second run: 304s without any Link header must still walk both pages
+    puller.session.get = lambda url, params=None, **kwargs: DummyResponse(304)
+    assert [r["name"] for r in puller.get_all_repos("dummyorg")] == ["repo1", "repo2"]
+
+def test_get_all_repos_403_retries_are_bounded(monkeypatch):
+    puller = GitHubOrgPuller()
+    puller.session.get = lambda url, params=None, **kwargs: DummyResponse(403, headers={"Retry-After": "1"})
+    slept = []
+    monkeypatch.setattr('time.sleep', lambda s: slept.append(s))
+    with pytest.raises(ValueError):
+        puller.get_all_repos("dummyorg")
+    assert slept == [1, 1, 1]
+
+def test_get_all_repos_403_with_http_date_retry_after_raises(monkeypatch):
+    puller = GitHubOrgPuller()
+    puller.session.get = lambda url, params=None, **kwargs: DummyResponse(
+        403, headers={"Retry-After": "Sat, 30 Aug 2026 12:00:00 GMT"})
+    monkeypatch.setattr('time.sleep', lambda s: pytest.fail("should not sleep on unparsed Retry-After"))
+    with pytest.raises(ValueError):
+        puller.get_all_repos("dummyorg")
+
+def test_parse_repo_page_streams_with_ijson():
+    pytest.importorskip("ijson")
+
+    class FakeRaw:
+        """Minimal stand-in for urllib3's raw response stream."""
+        def __init__(self, data):
+            self._buf = io.BytesIO(data)
+            self.decode_content = False
+        def read(self, size=-1):
+            return self._buf.read(size)
+
+    body = json.dumps([
+        {"name": "repo1", "fork": False, "archived": False,
+         "clone_url": "u", "ssh_url": "s", "owner": {"login": "x"},
+         "permissions": {"admin": True}},
+        {"name": "repo2", "fork": True, "archived": True,
+         "clone_url": "u2", "ssh_url": "s2"},
+    ]).encode()
+    resp = DummyResponse(200)
+    resp.raw = FakeRaw(body)
+    page = GitHubOrgPuller._parse_repo_page(resp)
+    assert resp.raw.decode_content is True
+    assert page == [
+        {"name": "repo1", "clone_url": "u", "ssh_url": "s", "fork": False, "archived": False},
+        {"name": "repo2", "clone_url": "u2", "ssh_url": "s2", "fork": True, "archived": True},
+    ]